@@ -1,23 +1,38 @@
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi.responses import Response, JSONResponse, HTMLResponse, StreamingResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
+from dataclasses import dataclass
 from typing import Optional, Dict, Any, List
-from datetime import datetime
-import json
+from datetime import datetime, timezone
+import orjson
 import logging
-from pathlib import Path
+import queue
+from logging.handlers import QueueHandler, QueueListener
+import asyncio
 import sqlite3
-from contextlib import contextmanager
+from contextlib import asynccontextmanager
+from pathlib import Path
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+import aiosqlite
+import aiofiles
+from aiosqlitepool import SQLiteConnectionPool
 
-# Configure logging
+# Configure logging; records are formatted and queued on the request path, and
+# written to file/console by a listener thread started on startup
+log_queue = queue.Queue(-1)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler('callback_logs.log'),
-        logging.StreamHandler()
-    ]
+        QueueHandler(log_queue)
+    ],
+    force=True  # worker processes import this module twice; keep the handler that feeds log_listener
+)
+log_listener = QueueListener(
+    log_queue,
+    logging.FileHandler('callback_logs.log'),
+    logging.StreamHandler()
 )
 logger = logging.getLogger(__name__)
 
@@ -25,7 +40,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Fedo Callback Service",
     description="Service to receive and store Fedo scan callback results",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware - IMPORTANT for cross-origin requests
@@ -37,13 +53,70 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
+# Templates; compiled once and cached, not reloaded from disk per request
+templates = Environment(
+    loader=FileSystemLoader(Path(__file__).parent / "templates"),
+    autoescape=True,
+    auto_reload=False,
+    bytecode_cache=FileSystemBytecodeCache(),
+    enable_async=True
+)
+RESULTS_TEMPLATE = templates.get_template("results.html")
+
 # Database setup
 DB_PATH = "fedo_callbacks.db"
+BACKUP_PATH = "callback_results.jsonl"
+
+# Per-connection tuning; WAL lets readers proceed while a callback is being written
+DB_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",  # 16 MB
+    "PRAGMA mmap_size=268435456",  # 256 MB
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA wal_autocheckpoint=1000",
+]
+
+# Connections shared by request handlers; the callback writer has its own
+DB_POOL_SIZE = 5
+
+# Callback inserts are queued and committed in batches of up to this many rows / this long
+WRITE_BATCH_SIZE = 100
+WRITE_BATCH_DELAY = 0.01  # seconds
+WRITE_TIMEOUT = 30  # seconds a handler waits for its batch to commit
+
+# Hot-path statements. sqlite3 caches compiled statements per connection, keyed by
+# SQL text, and pooled connections live across requests, so each is parsed once per
+# connection; sharing the strings also lets the HTML and JSON listings share one entry
+INSERT_CALLBACK_SQL = """
+    INSERT INTO callbacks 
+    (customer_id, scan_id, timestamp, status, callback_data, created_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+# Column order matches CallbackRecord, which is filled by position
+LIST_CALLBACKS_SQL = """
+    SELECT id, customer_id, scan_id, timestamp, status, callback_data, created_at
+    FROM callbacks 
+    ORDER BY created_at DESC 
+    LIMIT ? OFFSET ?
+"""
+CUSTOMER_CALLBACKS_SQL = """
+    SELECT id, customer_id, scan_id, timestamp, status, callback_data, created_at
+    FROM callbacks 
+    WHERE customer_id = ? 
+    ORDER BY created_at DESC
+"""
+DELETE_CALLBACK_SQL = "DELETE FROM callbacks WHERE id = ?"
+CALLBACK_COUNT_SQL = "SELECT value FROM meta WHERE key = 'callback_count'"
+ADJUST_CALLBACK_COUNT_SQL = "UPDATE meta SET value = value + ? WHERE key = 'callback_count'"
 
 def init_db():
     """Initialize SQLite database"""
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
+    for pragma in DB_PRAGMAS:
+        cursor.execute(pragma)
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS callbacks (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -55,18 +128,118 @@ def init_db():
             created_at TEXT
         )
     """)
+    # Index lookups by customer and the newest-first ordering used by /results
+    cursor.execute("""
+        SELECT COUNT(*) FROM sqlite_master
+        WHERE type = 'index'
+        AND name IN ('idx_callbacks_customer_created', 'idx_callbacks_created')
+    """)
+    indexes_missing = cursor.fetchone()[0] < 2
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_callbacks_customer_created
+        ON callbacks(customer_id, created_at DESC)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_callbacks_created
+        ON callbacks(created_at DESC)
+    """)
+    # Running total of callbacks, kept in step with inserts/deletes to avoid COUNT(*) scans
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER
+        )
+    """)
+    cursor.execute("""
+        INSERT OR IGNORE INTO meta (key, value)
+        VALUES ('callback_count', (SELECT COUNT(*) FROM callbacks))
+    """)
+    # Gather planner statistics once, when the indexes are first built
+    if indexes_missing:
+        cursor.execute("ANALYZE")
     conn.commit()
     conn.close()
 
-@contextmanager
-def get_db():
-    """Context manager for database connections"""
-    conn = sqlite3.connect(DB_PATH)
+# Connection pool, created on startup and closed on shutdown
+pool: Optional[SQLiteConnectionPool] = None
+
+async def connection_factory():
+    """Open a new pooled database connection"""
+    conn = await aiosqlite.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
-    try:
+    for pragma in DB_PRAGMAS:
+        await conn.execute(pragma)
+    return conn
+
+@asynccontextmanager
+async def get_db():
+    """Context manager for pooled database connections"""
+    async with pool.connection() as conn:
         yield conn
-    finally:
-        conn.close()
+
+def utc_now_iso():
+    """Current UTC time as a naive ISO 8601 string, the format stored in created_at"""
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
+async def get_callback_count(conn):
+    """Read the maintained total number of stored callbacks"""
+    cursor = await conn.execute(CALLBACK_COUNT_SQL)
+    return (await cursor.fetchone())["value"]
+
+# Callback write queue, its writer task and the writer's dedicated connection, created on startup
+write_queue: Optional[asyncio.Queue] = None
+writer_task: Optional[asyncio.Task] = None
+writer_conn: Optional[aiosqlite.Connection] = None
+
+async def reset_writer_conn():
+    """Roll back a failed batch, reopening the writer connection if that fails too"""
+    global writer_conn
+    try:
+        if writer_conn.in_transaction:
+            await writer_conn.rollback()
+        return
+    except Exception as e:
+        logger.error(f"Error rolling back callback batch, reopening connection: {str(e)}", exc_info=True)
+    try:
+        await writer_conn.close()
+    except Exception:
+        pass
+    try:
+        writer_conn = await connection_factory()
+    except Exception as e:
+        # Keep the writer alive; the next batch fails and retries the reopen
+        logger.error(f"Error reopening writer connection: {str(e)}", exc_info=True)
+
+async def callback_writer():
+    """Drain queued callback rows and commit each batch in a single transaction"""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await write_queue.get()]
+        deadline = loop.time() + WRITE_BATCH_DELAY
+        while len(batch) < WRITE_BATCH_SIZE:
+            try:
+                batch.append(await asyncio.wait_for(write_queue.get(), deadline - loop.time()))
+            except asyncio.TimeoutError:
+                break
+        
+        try:
+            await writer_conn.execute("BEGIN IMMEDIATE")
+            await writer_conn.executemany(INSERT_CALLBACK_SQL, [row for row, _ in batch])
+            await writer_conn.execute(ADJUST_CALLBACK_COUNT_SQL, (len(batch),))
+            await writer_conn.commit()
+        except Exception as e:
+            logger.error(f"Error writing callback batch: {str(e)}", exc_info=True)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            await reset_writer_conn()
+        else:
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+        finally:
+            for _ in batch:
+                write_queue.task_done()
 
 # Initialize database on startup
 init_db()
@@ -85,16 +258,54 @@ class CallbackResponse(BaseModel):
     message: str
     received_at: str
 
+# Stored callback row; serialized natively by orjson, no per-row dict or __dict__
+@dataclass(slots=True)
+class CallbackRecord:
+    id: int
+    customer_id: str
+    scan_id: str
+    timestamp: str
+    status: str
+    callback_data: orjson.Fragment
+    created_at: str
+
+    @classmethod
+    def from_row(cls, row):
+        """Build from a plain tuple row selected by LIST_/CUSTOMER_CALLBACKS_SQL"""
+        return cls(row[0], row[1], row[2], row[3], row[4], orjson.Fragment(row[5]), row[6])
+
 @app.on_event("startup")
 async def startup_event():
     """Run on application startup"""
+    global pool, write_queue, writer_task, writer_conn
+    log_listener.start()
     logger.info("Fedo Callback Service started")
     init_db()
+    pool = SQLiteConnectionPool(connection_factory, pool_size=DB_POOL_SIZE)
+    writer_conn = await connection_factory()
+    write_queue = asyncio.Queue()
+    writer_task = asyncio.create_task(callback_writer())
 
-@app.get("/", response_class=HTMLResponse)
-async def root():
-    """Root endpoint with HTML interface"""
-    html_content = """
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Run on application shutdown"""
+    if writer_task is not None:
+        if not writer_task.done():
+            await write_queue.join()
+        writer_task.cancel()
+        try:
+            await writer_task
+        except asyncio.CancelledError:
+            pass
+    if writer_conn is not None:
+        await writer_conn.close()
+    if pool is not None:
+        await pool.close()
+    logger.info("Fedo Callback Service stopped")
+    log_listener.stop()
+
+# Static pages/payloads, encoded once at import time
+ROOT_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -153,22 +364,54 @@ async def root():
     </body>
     </html>
     """
-    return html_content
+ROOT_HTML_BYTES = ROOT_HTML.encode()
+
+@app.get("/", response_class=HTMLResponse)
+async def root():
+    """Root endpoint with HTML interface"""
+    return Response(content=ROOT_HTML_BYTES, media_type="text/html")
+
+HEALTH_INFO = {
+    "status": "healthy",
+    "service": "Fedo Callback Service",
+    "timestamp": None,
+    "cors_enabled": True,
+    "endpoints": {
+        "callback": "/consint/demo-callback (POST only)",
+        "results": "/results",
+        "docs": "/docs"
+    }
+}
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "service": "Fedo Callback Service",
-        "timestamp": datetime.utcnow().isoformat(),
-        "cors_enabled": True,
-        "endpoints": {
-            "callback": "/consint/demo-callback (POST only)",
-            "results": "/results",
-            "docs": "/docs"
-        }
+    # Only the timestamp changes between calls
+    health = dict(HEALTH_INFO)
+    health["timestamp"] = utc_now_iso()
+    return ORJSONResponse(health)
+
+CALLBACK_INFO_BYTES = orjson.dumps({
+    "message": "This endpoint accepts POST requests only",
+    "method": "POST",
+    "endpoint": "/consint/demo-callback",
+    "cors_enabled": True,
+    "expected_payload": {
+        "customerID": "string",
+        "scanID": "string",
+        "status": "string (optional)",
+        "data": "object (optional)",
+        "metadata": "object (optional)",
+        "timestamp": "string (optional)"
+    },
+    "example": {
+        "customerID": "CUST_12345",
+        "scanID": "SCN_001",
+        "status": "completed",
+        "data": {"heartRate": 75, "spo2": 98},
+        "metadata": {"age": 35, "gender": "male"}
     }
+})
 
 # Handle GET requests to callback endpoint (informational only)
 @app.get("/consint/demo-callback")
@@ -177,27 +420,7 @@ async def callback_info():
     Information endpoint for callback URL
     This endpoint only accepts POST requests for actual callbacks
     """
-    return {
-        "message": "This endpoint accepts POST requests only",
-        "method": "POST",
-        "endpoint": "/consint/demo-callback",
-        "cors_enabled": True,
-        "expected_payload": {
-            "customerID": "string",
-            "scanID": "string",
-            "status": "string (optional)",
-            "data": "object (optional)",
-            "metadata": "object (optional)",
-            "timestamp": "string (optional)"
-        },
-        "example": {
-            "customerID": "CUST_12345",
-            "scanID": "SCN_001",
-            "status": "completed",
-            "data": {"heartRate": 75, "spo2": 98},
-            "metadata": {"age": 35, "gender": "male"}
-        }
-    }
+    return Response(content=CALLBACK_INFO_BYTES, media_type="application/json")
 
 @app.post("/consint/demo-callback", response_model=CallbackResponse)
 async def receive_callback(request: Request, callback_data: CallbackData):
@@ -205,46 +428,34 @@ async def receive_callback(request: Request, callback_data: CallbackData):
     Receive and store callback results from Fedo scan
     """
     try:
-        received_at = datetime.utcnow().isoformat()
+        received_at = utc_now_iso()
         
         # Log the incoming request
         logger.info(f"Received callback for Customer: {callback_data.customerID}, Scan: {callback_data.scanID}")
-        logger.info(f"Callback data: {callback_data.model_dump_json()}")
+        payload_json = callback_data.model_dump_json()
+        logger.debug(f"Callback data: {payload_json}")
         
-        # Store in database
-        with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO callbacks 
-                (customer_id, scan_id, timestamp, status, callback_data, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                callback_data.customerID,
-                callback_data.scanID,
-                callback_data.timestamp or received_at,
-                callback_data.status or "received",
-                callback_data.model_dump_json(),
-                received_at
-            ))
-            conn.commit()
+        # Store in database via the batching writer; resolves once the batch is committed
+        future = asyncio.get_running_loop().create_future()
+        await write_queue.put(((
+            callback_data.customerID,
+            callback_data.scanID,
+            callback_data.timestamp or received_at,
+            callback_data.status or "received",
+            payload_json,
+            received_at
+        ), future))
+        if writer_task.done():
+            raise RuntimeError("Callback writer is not running")
+        try:
+            await asyncio.wait_for(future, WRITE_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"Timed out after {WRITE_TIMEOUT}s waiting for the callback to be stored")
             
-        # Also save to JSON file as backup
-        log_file = Path("callback_results.json")
-        results = []
-        if log_file.exists():
-            with open(log_file, 'r') as f:
-                try:
-                    results = json.load(f)
-                except json.JSONDecodeError:
-                    results = []
-        
-        results.append({
-            "received_at": received_at,
-            **callback_data.model_dump()
-        })
-        
-        with open(log_file, 'w') as f:
-            json.dump(results, f, indent=2)
+        # Also append to JSON Lines file as backup; received_at is spliced in ahead
+        # of the payload's own fields rather than re-serializing the payload
+        async with aiofiles.open(BACKUP_PATH, "a") as f:
+            await f.write(f'{{"received_at":"{received_at}",{payload_json[1:]}\n')
         
         logger.info(f"Successfully stored callback for {callback_data.customerID}")
         
@@ -269,90 +480,18 @@ async def get_all_results_html(request: Request, limit: int = 100, offset: int =
         if "application/json" in accept_header or "json" in request.url.query:
             return await get_all_results_json(limit, offset)
         
-        # Return HTML for browser
-        with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM callbacks 
-                ORDER BY created_at DESC 
-                LIMIT ? OFFSET ?
-            """, (limit, offset))
-            
-            results = []
-            for row in cursor.fetchall():
-                results.append({
-                    "id": row["id"],
-                    "customer_id": row["customer_id"],
-                    "scan_id": row["scan_id"],
-                    "timestamp": row["timestamp"],
-                    "status": row["status"],
-                    "callback_data": json.loads(row["callback_data"]),
-                    "created_at": row["created_at"]
-                })
-            
-            cursor.execute("SELECT COUNT(*) as count FROM callbacks")
-            total = cursor.fetchone()["count"]
-            
-            # Generate HTML
-            html_content = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>Callback Results</title>
-                <style>
-                    body {{ font-family: Arial, sans-serif; max-width: 1200px; margin: 20px auto; padding: 20px; }}
-                    h1 {{ color: #2c3e50; }}
-                    .stats {{ background: #f8f9fa; padding: 15px; margin: 20px 0; border-radius: 5px; }}
-                    .result {{ background: #fff; border: 1px solid #dee2e6; padding: 15px; margin: 10px 0; border-radius: 5px; }}
-                    .result-header {{ font-weight: bold; color: #495057; margin-bottom: 10px; }}
-                    pre {{ background: #f8f9fa; padding: 10px; border-radius: 3px; overflow-x: auto; }}
-                    .status {{ padding: 3px 8px; border-radius: 3px; font-size: 12px; }}
-                    .status-received {{ background: #d1ecf1; color: #0c5460; }}
-                    .status-completed {{ background: #d4edda; color: #155724; }}
-                    a {{ color: #007bff; text-decoration: none; }}
-                    a:hover {{ text-decoration: underline; }}
-                </style>
-            </head>
-            <body>
-                <h1>📊 Callback Results</h1>
-                
-                <div class="stats">
-                    <strong>Total Callbacks:</strong> {total} | 
-                    <strong>Showing:</strong> {offset + 1 if total > 0 else 0} - {min(offset + limit, total)} |
-                    <a href="/">← Back to Home</a> | 
-                    <a href="/results?format=json">View as JSON</a>
-                </div>
-            """
-            
-            if not results:
-                html_content += "<p>No callbacks received yet.</p>"
-            else:
-                for result in results:
-                    status_class = f"status-{result['status']}" if result['status'] in ['received', 'completed'] else 'status-received'
-                    html_content += f"""
-                    <div class="result">
-                        <div class="result-header">
-                            <strong>Customer:</strong> {result['customer_id']} | 
-                            <strong>Scan:</strong> {result['scan_id']} | 
-                            <span class="status {status_class}">{result['status']}</span>
-                        </div>
-                        <div><strong>Received:</strong> {result['created_at']}</div>
-                        <details>
-                            <summary style="cursor: pointer; margin-top: 10px;">View Full Data</summary>
-                            <pre>{json.dumps(result['callback_data'], indent=2)}</pre>
-                        </details>
-                    </div>
-                    """
-            
-            html_content += """
-                <div style="margin-top: 20px;">
-                    <a href="/">← Back to Home</a>
-                </div>
-            </body>
-            </html>
-            """
-            
-            return html_content
+        # Fetch the page up front so the connection goes back to the pool
+        # before a slow client starts downloading the body
+        async with get_db() as conn:
+            total = await get_callback_count(conn)
+            cursor = await conn.execute(LIST_CALLBACKS_SQL, (limit, offset))
+            rows = await cursor.fetchall()
+        
+        # Stream HTML for browser, rendered one row at a time
+        return StreamingResponse(
+            RESULTS_TEMPLATE.generate_async(rows=rows, total=total, limit=limit, offset=offset),
+            media_type="text/html"
+        )
             
     except Exception as e:
         logger.error(f"Error retrieving results: {str(e)}", exc_info=True)
@@ -361,35 +500,20 @@ async def get_all_results_html(request: Request, limit: int = 100, offset: int =
 async def get_all_results_json(limit: int = 100, offset: int = 0):
     """JSON API for results"""
     try:
-        with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM callbacks 
-                ORDER BY created_at DESC 
-                LIMIT ? OFFSET ?
-            """, (limit, offset))
+        async with get_db() as conn:
+            cursor = await conn.execute(LIST_CALLBACKS_SQL, (limit, offset))
+            cursor.row_factory = None
+            results = [CallbackRecord.from_row(row) for row in await cursor.fetchall()]
             
-            results = []
-            for row in cursor.fetchall():
-                results.append({
-                    "id": row["id"],
-                    "customer_id": row["customer_id"],
-                    "scan_id": row["scan_id"],
-                    "timestamp": row["timestamp"],
-                    "status": row["status"],
-                    "callback_data": json.loads(row["callback_data"]),
-                    "created_at": row["created_at"]
-                })
+            total = await get_callback_count(conn)
             
-            cursor.execute("SELECT COUNT(*) as count FROM callbacks")
-            total = cursor.fetchone()["count"]
-            
-            return {
+            # Returned directly so orjson splices the stored callback_data text verbatim
+            return ORJSONResponse({
                 "total": total,
                 "limit": limit,
                 "offset": offset,
                 "results": results
-            }
+            })
     except Exception as e:
         logger.error(f"Error retrieving results: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error retrieving results: {str(e)}")
@@ -400,34 +524,20 @@ async def get_results_by_customer(customer_id: str):
     Retrieve callback results for a specific customer
     """
     try:
-        with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM callbacks 
-                WHERE customer_id = ? 
-                ORDER BY created_at DESC
-            """, (customer_id,))
-            
-            results = []
-            for row in cursor.fetchall():
-                results.append({
-                    "id": row["id"],
-                    "customer_id": row["customer_id"],
-                    "scan_id": row["scan_id"],
-                    "timestamp": row["timestamp"],
-                    "status": row["status"],
-                    "callback_data": json.loads(row["callback_data"]),
-                    "created_at": row["created_at"]
-                })
+        async with get_db() as conn:
+            cursor = await conn.execute(CUSTOMER_CALLBACKS_SQL, (customer_id,))
+            cursor.row_factory = None
+            results = [CallbackRecord.from_row(row) for row in await cursor.fetchall()]
             
             if not results:
                 raise HTTPException(status_code=404, detail=f"No results found for customer {customer_id}")
             
-            return {
+            # Returned directly so orjson splices the stored callback_data text verbatim
+            return ORJSONResponse({
                 "customer_id": customer_id,
                 "total_scans": len(results),
                 "results": results
-            }
+            })
     except HTTPException:
         raise
     except Exception as e:
@@ -440,14 +550,15 @@ async def delete_result(callback_id: int):
     Delete a specific callback result
     """
     try:
-        with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM callbacks WHERE id = ?", (callback_id,))
-            conn.commit()
+        async with get_db() as conn:
+            cursor = await conn.execute(DELETE_CALLBACK_SQL, (callback_id,))
             
             if cursor.rowcount == 0:
                 raise HTTPException(status_code=404, detail=f"Result with ID {callback_id} not found")
             
+            await conn.execute(ADJUST_CALLBACK_COUNT_SQL, (-1,))
+            await conn.commit()
+            
             return {"success": True, "message": f"Result {callback_id} deleted successfully"}
     except HTTPException:
         raise
@@ -456,5 +567,21 @@ async def delete_result(callback_id: int):
         raise HTTPException(status_code=500, detail=f"Error deleting result: {str(e)}")
 
 if __name__ == "__main__":
+    import os
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # Workers each get their own connection pool; WAL keeps them from blocking each other.
+    # loop="auto" picks uvloop where it is installed (not available on Windows).
+    # log_config=None routes uvicorn's records through the root QueueHandler, so the
+    # supervisor process needs its own listener running (workers start theirs on startup)
+    log_listener.start()
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",
+        http="httptools",
+        workers=os.cpu_count(),
+        log_config=None,
+        access_log=False
+    )
+    log_listener.stop()
\ No newline at end of file